@@ -0,0 +1,120 @@
+"""NumPy helpers for histogram-based color extraction.
+
+These functions have no Griptape dependencies so they can be used and tested on their own.
+"""
+
+import numpy as np
+
+# Colors closer than this (Euclidean RGB distance) are treated as duplicates
+MIN_COLOR_DISTANCE = 30
+
+# Offsets of the 27 cells in a 3x3x3 histogram neighborhood
+_NEIGHBOR_OFFSETS = np.stack(np.meshgrid([-1, 0, 1], [-1, 0, 1], [-1, 0, 1], indexing="ij"), axis=-1).reshape(-1, 3)
+
+# Strides of a 64x64x64 histogram padded by one empty cell on every side (66x66x66)
+_PADDED_STRIDES = np.array([66 * 66, 66, 1])
+_PADDED_NEIGHBOR_OFFSETS = _NEIGHBOR_OFFSETS @ _PADDED_STRIDES
+
+
+def select_prominent_colors(
+    colors: np.ndarray, counts: np.ndarray, num_colors: int, min_distance: int = MIN_COLOR_DISTANCE
+) -> np.ndarray:
+    """Order candidate colors by prominence and drop near-duplicates.
+    
+    Candidates are sorted by their prominence score, then accepted greedily: each
+    accepted color removes every remaining candidate closer than min_distance, so
+    the whole list can be walked without building a K x K distance matrix.
+    
+    Args:
+        colors: Array of shape (K, 3) holding candidate colors
+        counts: Array of shape (K,) holding the prominence score of each candidate
+        num_colors: Maximum number of colors to return
+        min_distance: Minimum Euclidean distance between two returned colors
+        
+    Returns:
+        Array of shape (C, 3), C <= num_colors, ordered by prominence (most prominent first)
+    """
+    order = np.argsort(-counts, kind="stable")
+    remaining = colors[order].astype(np.int32)
+    
+    keep: list[np.ndarray] = []
+    while len(remaining) and len(keep) < num_colors:
+        color = remaining[0]
+        keep.append(color)
+        diff = remaining - color
+        remaining = remaining[np.einsum("ij,ij->i", diff, diff) >= min_distance ** 2]
+    
+    return np.array(keep, dtype=np.int32).reshape(-1, 3)
+
+
+def quantize6(pixels: np.ndarray) -> np.ndarray:
+    """Posterize pixels to 6 bits per channel and pack them as (c0 << 12) | (c1 << 6) | c2.
+    
+    Args:
+        pixels: Array of shape (N, 3) holding 8-bit pixels in any 3-channel color space
+        
+    Returns:
+        Array of shape (N,) holding uint32 bin indices in [0, 262144)
+    """
+    # Posterize in uint8 and pack into uint32 (18 bits) so no int64 copy of every pixel is made
+    quantized = pixels >> 2
+    idx = quantized[:, 0].astype(np.uint32) << 12
+    idx |= quantized[:, 1].astype(np.uint32) << 6
+    idx |= quantized[:, 2]
+    return idx
+
+
+def build_histogram(idx: np.ndarray) -> np.ndarray:
+    """Count posterized pixels in a 64x64x64 histogram.
+    
+    Args:
+        idx: Array of shape (N,) holding bin indices returned by quantize6
+        
+    Returns:
+        Array of shape (64, 64, 64) holding the pixel count of each posterized color
+    """
+    return np.bincount(idx, minlength=262144).reshape(64, 64, 64)
+
+
+def bin_mean_colors(idx: np.ndarray, pixels: np.ndarray, bins: np.ndarray) -> np.ndarray:
+    """Average the pixels that fall into each of the given histogram bins.
+    
+    Args:
+        idx: Array of shape (N,) holding the bin index of each pixel
+        pixels: Array of shape (N, 3) holding the pixels to average, in any color space
+        bins: Array of shape (C,) holding distinct, non-empty bin indices
+        
+    Returns:
+        Array of shape (C, 3) holding the rounded uint8 mean pixel of each bin
+    """
+    # Map every pixel to the position of its bin in `bins`, or -1 if it is not selected
+    slot = np.full(262144, -1, dtype=np.intp)
+    slot[bins] = np.arange(len(bins))
+    pixel_slot = slot[idx]
+    rows = np.flatnonzero(pixel_slot >= 0)
+    pixel_slot = pixel_slot[rows]
+    members = pixels[rows]
+    
+    counts = np.bincount(pixel_slot, minlength=len(bins))
+    sums = np.stack(
+        [np.bincount(pixel_slot, weights=members[:, c], minlength=len(bins)) for c in range(3)],
+        axis=1,
+    )
+    return np.rint(sums / counts[:, None]).astype(np.uint8)
+
+
+def histogram_prominence(hist: np.ndarray, colors: np.ndarray) -> np.ndarray:
+    """Score colors by the number of pixels in their 3x3x3 histogram neighborhood.
+    
+    Args:
+        hist: Histogram returned by build_histogram
+        colors: Array of shape (K, 3) holding colors to score, in the histogram's color space
+        
+    Returns:
+        Array of shape (K,) holding the neighborhood pixel count of each color
+    """
+    # Pad with empty cells so edge neighbors need no bounds checks, then gather the 27
+    # neighbors of each color as flat offsets into the padded histogram
+    padded = np.pad(hist, 1).ravel()
+    cells = ((colors >> 2) + 1) @ _PADDED_STRIDES
+    return padded[cells[:, None] + _PADDED_NEIGHBOR_OFFSETS].sum(axis=1)
@@ -1,5 +1,14 @@
 import logging
 import io
+import os
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 from PIL import Image
 
 from griptape_nodes.exe_types.core_types import Parameter, ParameterMode
@@ -13,7 +22,23 @@ from griptape_nodes_library.utils.image_utils import dict_to_image_url_artifact,
 
 from griptape.artifacts import ImageArtifact, ImageUrlArtifact
 
-from Pylette import extract_colors
+try:
+    from keycolors._histogram import (
+        bin_mean_colors,
+        build_histogram,
+        histogram_prominence,
+        quantize6,
+        select_prominent_colors,
+    )
+except ImportError:
+    # Griptape Nodes loads this file by path, with the library directory importable
+    from _histogram import (
+        bin_mean_colors,
+        build_histogram,
+        histogram_prominence,
+        quantize6,
+        select_prominent_colors,
+    )
 
 
 logger = logging.getLogger(__name__)
@@ -21,8 +46,82 @@ logger = logging.getLogger(__name__)
 # Maximum number of colors that can be extracted
 MAX_COLORS = 12
 
+# Histogram candidates closer than this (Euclidean YCbCr distance) are treated as duplicates.
+# YCbCr compresses chroma differences, so the threshold is tighter than the RGB one.
+MIN_YCBCR_DISTANCE = 20
+
+# Images are decoded and downsampled to fit within this size before color extraction
+MAX_IMAGE_SIZE = 256
+
+# Number of decoded images kept in memory, so re-running on the same input skips decoding
+PIXEL_CACHE_SIZE = 8
+
+# Two-digit hex strings for every channel value, used to format colors without str.format
+_HEX: tuple[str, ...] = tuple(f"{i:02x}" for i in range(256))
+
+_pixel_cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+_pixel_cache_lock = threading.Lock()
+
+
+@functools.cache
+def _pylette_extract_colors() -> Callable:
+    """Import Pylette's extract_colors on first use and keep the reference.
+    
+    Pylette is only needed for the KMeans and MedianCut algorithms, so it is not
+    imported at module load.
+    """
+    from Pylette import extract_colors
+    return extract_colors
+
+
+def _load_pixels(image_bytes: bytes) -> np.ndarray:
+    """Decode and downsample an image to RGB pixels, caching the result by content hash.
+    
+    Args:
+        image_bytes: Raw image data as bytes
+        
+    Returns:
+        Read-only uint8 array of shape (H, W, 3), fitting within MAX_IMAGE_SIZE
+    """
+    key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+    with _pixel_cache_lock:
+        pixels = _pixel_cache.get(key)
+        if pixels is not None:
+            _pixel_cache.move_to_end(key)
+    if pixels is not None:
+        logger.debug("Using cached pixels for image")
+        return pixels
+    
+    image = Image.open(io.BytesIO(image_bytes))
+    
+    # Let the JPEG decoder downscale in the DCT domain; a no-op for other formats
+    image.draft('RGB', (MAX_IMAGE_SIZE, MAX_IMAGE_SIZE))
+    
+    # Palette, bilevel and alpha images are converted before resampling so that resizing
+    # does not fall back to nearest-neighbour or blend in premultiplied alpha; all other
+    # modes are resampled first so the conversion touches fewer pixels
+    if image.mode in ('1', 'P', 'PA', 'LA', 'RGBA'):
+        image = image.convert('RGB')
+    
+    image.thumbnail((MAX_IMAGE_SIZE, MAX_IMAGE_SIZE))
+    
+    # Convert to RGB if necessary
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    
+    # Wrap the raw buffer directly; arrays over immutable bytes are read-only
+    pixels = np.frombuffer(image.tobytes(), dtype=np.uint8).reshape(image.height, image.width, 3)
+    
+    with _pixel_cache_lock:
+        _pixel_cache[key] = pixels
+        if len(_pixel_cache) > PIXEL_CACHE_SIZE:
+            _pixel_cache.popitem(last=False)
+    
+    return pixels
+
+
 class ExtractKeyColors(DataNode):
-    """A node that extracts dominant colors from images using Pylette's color extraction algorithms.
+    """A node that extracts dominant colors from images using a color histogram or Pylette's algorithms.
     
     This node analyzes an input image and extracts the most prominent colors,
     creating dynamic color picker parameters for each extracted color. The colors
@@ -31,10 +130,11 @@ class ExtractKeyColors(DataNode):
     Features:
     - Supports ImageArtifact and ImageUrlArtifact inputs
     - Configurable number of colors to extract (1-12)
-    - Choice between KMeans and MedianCut extraction algorithms
+    - Choice between Histogram, KMeans and MedianCut extraction algorithms
     - Dynamic color picker parameters for each extracted color
     - Pretty-printed color output for inspection
     - Automatic parameter cleanup between runs
+    - Concurrent extraction for batches of images via process_batch
     """
     
     def __init__(self, **kwargs) -> None:
@@ -43,8 +143,9 @@ class ExtractKeyColors(DataNode):
         Sets up the node with:
         - input_image: Parameter for the source image
         - num_colors: Parameter for the target number of colors to extract
-        - algorithm: Parameter for selecting the extraction algorithm (KMeans or MedianCut)
+        - algorithm: Parameter for selecting the extraction algorithm (Histogram, KMeans or MedianCut)
         - number_of_color_params: Internal counter for dynamic parameters
+        - _live_color_params: Names of the color parameters created by the last run
         
         Args:
             **kwargs: Additional keyword arguments passed to the parent DataNode
@@ -52,6 +153,8 @@ class ExtractKeyColors(DataNode):
         super().__init__(**kwargs)
 
         self.number_of_color_params = 0 # Internal counter for dynamic parameters
+        # None until the first clear, since parameters may have been restored from a saved workflow
+        self._live_color_params: list[str] | None = None
 
         self.add_parameter(
             Parameter(
@@ -89,8 +192,8 @@ class ExtractKeyColors(DataNode):
                 name="algorithm",
                 tooltip="Color extraction algorithm to use",
                 type=ParameterTypeBuiltin.STR.value,
-                traits={Options(choices=["KMeans", "MedianCut"])},
-                default_value="KMeans",
+                traits={Options(choices=["Histogram", "KMeans", "MedianCut"])},
+                default_value="Histogram",
                 allowed_modes=[ParameterMode.INPUT,ParameterMode.PROPERTY],
                 ui_options={"display_name":"Extraction Algorithm"},
             )
@@ -134,17 +237,55 @@ class ExtractKeyColors(DataNode):
         except Exception as e:
             raise ValueError(f"Failed to extract image data: {str(e)}")
 
+    def _get_colors_by_prominence(self, pixels: np.ndarray, num_colors: int) -> np.ndarray:
+        """Extract colors from the peaks of a posterized YCbCr color histogram.
+        
+        Pixels are converted to YCbCr, which separates brightness from color, and counted
+        once in a 6-bit-per-channel histogram. Every non-empty bin is a candidate, scored
+        by the pixel count of its 3x3x3 neighborhood so that a color split across adjacent
+        bins is not under-ranked. Candidates are accepted in score order, skipping any too
+        close to one already accepted, so a noisy dominant color spread over many bins
+        cannot crowd out the smaller regions. Each selected color is reported as the
+        mean RGB of the pixels in its bin, so uniform regions come back exactly rather
+        than as a bin center.
+        
+        Args:
+            pixels: Array of shape (H, W, 3) holding RGB pixels
+            num_colors: Number of colors to extract
+            
+        Returns:
+            Array of shape (C, 3) holding RGB colors ordered by prominence (most prominent first)
+        """
+        rgb = pixels.reshape(-1, 3)
+        ycbcr = np.asarray(Image.fromarray(pixels).convert("YCbCr")).reshape(-1, 3)
+        idx = quantize6(ycbcr)
+        hist = build_histogram(idx)
+        
+        # All non-empty bins; the boolean mask is much faster than flatnonzero on the raw counts
+        bins = np.flatnonzero(hist.ravel() > 0)
+        
+        # Reconstruct the YCbCr center of each bin
+        candidates = np.stack([bins >> 12, (bins >> 6) & 63, bins & 63], axis=1) << 2 | 2
+        counts = histogram_prominence(hist, candidates)
+        
+        logger.debug(f"Histogram produced {len(candidates)} candidate colors from {len(ycbcr)} pixels")
+        
+        selected = select_prominent_colors(candidates, counts, num_colors, MIN_YCBCR_DISTANCE)
+        
+        # Bin centers are only used for ranking; report what the pixels actually look like
+        return bin_mean_colors(idx, rgb, quantize6(selected.astype(np.uint8)))
+
     def _get_colors_by_algorithm(self, image_bytes: bytes, num_colors: int, algorithm: str) -> list[tuple[int, int, int]]:
         """Extract colors using the specified algorithm, ordered by frequency.
         
-        This method uses Pylette's color extraction algorithms to extract the most prominent
-        colors from the image. Colors are automatically sorted by their frequency
-        in the image (most frequent first).
+        This method uses Pylette's color extraction algorithms, or a color histogram, to
+        extract the most prominent colors from the image. Colors are automatically sorted
+        by their frequency in the image (most frequent first).
         
         Args:
             image_bytes: Raw image data as bytes
             num_colors: Number of colors to extract
-            algorithm: Algorithm to use ('KMeans' or 'MedianCut')
+            algorithm: Algorithm to use ('Histogram', 'KMeans' or 'MedianCut')
             
         Returns:
             List of RGB tuples ordered by prominence (most prominent first)
@@ -153,38 +294,65 @@ class ExtractKeyColors(DataNode):
             ValueError: If image processing fails or algorithm is unsupported
         """
         try:
-            # Convert bytes to PIL Image object
-            image_io = io.BytesIO(image_bytes)
-            pil_image = Image.open(image_io)
+            pixels = _load_pixels(image_bytes)
             
-            # Convert to RGB if necessary
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
-            
-            # Determine Pylette mode based on algorithm selection
-            if algorithm == "KMeans":
-                pylette_mode = 'KMeans'
-            elif algorithm == "MedianCut":
-                pylette_mode = 'MedianCut'  # MedianCut mode in Pylette
+            if algorithm == "Histogram":
+                selected_colors = self._get_colors_by_prominence(pixels, num_colors)
             else:
-                raise ValueError(f"Unsupported algorithm: {algorithm}. Choose 'KMeans' or 'MedianCut'.")
-            
-            # Extract colors using Pylette with selected algorithm
-            palette = extract_colors(image=pil_image, palette_size=num_colors, mode=pylette_mode)
+                extract_colors = _pylette_extract_colors()
+                
+                # Determine Pylette mode based on algorithm selection
+                if algorithm == "KMeans":
+                    pylette_mode = 'KMeans'
+                elif algorithm == "MedianCut":
+                    pylette_mode = 'MedianCut'  # MedianCut mode in Pylette
+                else:
+                    raise ValueError(f"Unsupported algorithm: {algorithm}. Choose 'Histogram', 'KMeans' or 'MedianCut'.")
+                
+                # Extract colors using Pylette with selected algorithm
+                palette = extract_colors(image=Image.fromarray(pixels), palette_size=num_colors, mode=pylette_mode)
+                
+                logger.debug(f"Pylette extracted {len(palette.colors)} colors using {algorithm} algorithm")
+                
+                # Rank Pylette's colors by frequency and drop near-duplicates in one vectorized pass
+                colors = np.array([color.rgb for color in palette.colors], dtype=np.int32).reshape(-1, 3)
+                counts = np.array([color.freq for color in palette.colors], dtype=np.float64)
+                selected_colors = select_prominent_colors(colors, counts, num_colors)
+                
+                if logger.isEnabledFor(logging.DEBUG):
+                    for color, freq in zip(palette.colors, counts):
+                        r, g, b = color.rgb
+                        logger.debug(f"Pylette color: RGB({r:3d}, {g:3d}, {b:3d}) - frequency: {freq:.2%}")
             
-            logger.debug(f"Pylette extracted {len(palette.colors)} colors using {algorithm} algorithm")
-            
-            # Convert Pylette Color objects to RGB tuples
-            selected_colors = []
-            for color in palette.colors:
-                r, g, b = color.rgb
-                selected_colors.append((r, g, b))
-                logger.debug(f"Selected color: RGB({r:3d}, {g:3d}, {b:3d}) - frequency: {color.freq:.2%}")
-            
-            return selected_colors
+            # Colors stay in a NumPy array until this final conversion to plain tuples
+            return [(int(r), int(g), int(b)) for r, g, b in selected_colors]
             
         except Exception as e:
-            raise ValueError(f"Pylette color extraction failed: {str(e)}")
+            raise ValueError(f"{algorithm} color extraction failed: {str(e)}")
+
+    def _remove_parameters(self, param_names: list[str]) -> None:
+        """Remove the given parameters together with their stored values.
+        
+        Args:
+            param_names: Names of existing parameters to remove
+        """
+        for param_name in param_names:
+            logger.debug(f"Removing existing parameter: {param_name}")
+            # Clear parameter values first
+            if param_name in self.parameter_values:
+                del self.parameter_values[param_name]
+            if param_name in self.parameter_output_values:
+                del self.parameter_output_values[param_name]
+            # Remove the parameter itself
+            self.remove_parameter_element_by_name(param_name)
+
+    def _remove_parameters_by_prefix(self, prefix: str) -> None:
+        """Remove every parameter whose name starts with prefix, in a single scan.
+        
+        Args:
+            prefix: Name prefix of the parameters to remove
+        """
+        self._remove_parameters([param.name for param in self.parameters if param.name.startswith(prefix)])
 
     def _clear_color_picker_parameters(self) -> None:
         """Clear all dynamically created color picker parameters.
@@ -193,24 +361,46 @@ class ExtractKeyColors(DataNode):
         to prevent duplicate parameter errors when the node runs again with different
         numbers of colors. It also resets the internal parameter counter.
         
-        The method safely checks for parameter existence before attempting removal
-        to avoid errors if parameters don't exist.
+        Only the parameters created by the previous run are visited. On the first run
+        the node does not know which parameters were restored from a saved workflow,
+        so it scans its parameter list once for any color_ parameters.
         """
-        # Clear all color parameters that might exist (up to MAX_COLORS)
-        for i in range(1, MAX_COLORS + 1):  # Clear up to color_{MAX_COLORS} to be safe
-            param_name = f"color_{i}"
-            if self.get_parameter_by_name(param_name) is not None:
-                logger.debug(f"Removing existing parameter: {param_name}")
-                # Clear parameter values first
-                if param_name in self.parameter_values:
-                    del self.parameter_values[param_name]
-                if param_name in self.parameter_output_values:
-                    del self.parameter_output_values[param_name]
-                # Remove the parameter itself
-                self.remove_parameter_element_by_name(param_name)
+        if self._live_color_params is None:
+            self._remove_parameters_by_prefix("color_")
+        else:
+            self._remove_parameters(
+                [name for name in self._live_color_params if self.get_parameter_by_name(name) is not None]
+            )
         
+        self._live_color_params = []
         self.number_of_color_params = 0
 
+    def process_batch(self, images: list) -> list[list[tuple[int, int, int]]]:
+        """Extract colors from several images concurrently.
+        
+        Every image uses this node's current num_colors and algorithm values. Decoding
+        and extraction run in a thread pool, since PIL and NumPy release the GIL for
+        their heavy work. No color parameters are created; that stays with the caller.
+        
+        Args:
+            images: List of ImageArtifact, ImageUrlArtifact, or dict representations
+            
+        Returns:
+            One list of RGB tuples per input image, in input order
+            
+        Raises:
+            ValueError: If any image cannot be processed
+        """
+        num_colors = self.get_parameter_value("num_colors")
+        algorithm = self.get_parameter_value("algorithm")
+        
+        def extract(image_artifact) -> list[tuple[int, int, int]]:
+            image_bytes = self._image_to_bytes(image_artifact)
+            return self._get_colors_by_algorithm(image_bytes, num_colors, algorithm)
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return list(executor.map(extract, images))
+
     def process(self) -> None:
         """Main processing method that extracts colors from the input image.
         
@@ -218,17 +408,18 @@ class ExtractKeyColors(DataNode):
         1. Clears any existing color parameters from previous runs
         2. Retrieves the input image, target number of colors, and algorithm selection
         3. Converts the image artifact to bytes for processing
-        4. Uses the selected Pylette algorithm (KMeans or MedianCut) to extract dominant colors
+        4. Uses the selected algorithm (Histogram, KMeans or MedianCut) to extract dominant colors
         5. Colors are automatically ordered by frequency (most prominent first)
         6. Creates dynamic color picker parameters for each extracted color
         7. Logs color information for inspection
         
         The algorithm selection allows choosing between:
+        - Histogram: Picks the most prominent distinct bins of a posterized color histogram
         - KMeans: Uses clustering to identify dominant color groups
         - MedianCut: Uses recursive color space division for balanced color selection
         
-        Pylette handles color extraction, frequency calculation, and diversity automatically
-        for both algorithms.
+        Pylette handles color extraction and frequency calculation for KMeans and MedianCut;
+        near-duplicate colors are removed for all algorithms.
         
         The selected colors are made available as dynamic output parameters
         named color_1, color_2, etc., each containing the hexadecimal color value
@@ -248,20 +439,24 @@ class ExtractKeyColors(DataNode):
         num_colors = self.get_parameter_value("num_colors")
         algorithm = self.get_parameter_value("algorithm")
         
-        # Debug: Log image artifact information to detect caching issues
-        if hasattr(input_image, 'value'):
-            image_id = str(input_image.value)[:50] + "..." if len(str(input_image.value)) > 50 else str(input_image.value)
-            logger.debug(f"Processing image: {image_id}")
-        elif isinstance(input_image, dict):
-            image_id = str(input_image.get('value', 'unknown'))[:50] + "..." if len(str(input_image.get('value', 'unknown'))) > 50 else str(input_image.get('value', 'unknown'))
-            logger.debug(f"Processing image dict: {image_id}")
-        else:
-            logger.debug(f"Processing image of type: {type(input_image)}")
+        # Debug: Log image artifact information to detect caching issues.
+        # Guarded because str() of an in-memory image value renders the whole byte string.
+        if logger.isEnabledFor(logging.DEBUG):
+            if hasattr(input_image, 'value'):
+                image_value = str(input_image.value)
+                image_id = image_value[:50] + "..." if len(image_value) > 50 else image_value
+                logger.debug(f"Processing image: {image_id}")
+            elif isinstance(input_image, dict):
+                image_value = str(input_image.get('value', 'unknown'))
+                image_id = image_value[:50] + "..." if len(image_value) > 50 else image_value
+                logger.debug(f"Processing image dict: {image_id}")
+            else:
+                logger.debug(f"Processing image of type: {type(input_image)}")
             
         logger.debug(f"Extracting {num_colors} colors from input image using {algorithm} algorithm")
         image_bytes = self._image_to_bytes(input_image)
         
-        # Debug: Log image size (MD5 hash removed as it's expensive)
+        # Debug: Log image size (content hashing happens only in the pixel cache)
         logger.debug(f"Image data size: {len(image_bytes)} bytes")
         
         # Extract colors ordered by actual prominence in the image
@@ -273,7 +468,7 @@ class ExtractKeyColors(DataNode):
 
         for i, color in enumerate(selected_colors, 1):
             r, g, b = color
-            hex_color = f"#{r:02x}{g:02x}{b:02x}"
+            hex_color = "#" + _HEX[r] + _HEX[g] + _HEX[b]
             logger.debug(f"  Color {i}: RGB({r:3d}, {g:3d}, {b:3d}) | Hex: {hex_color}")
             
             param_name = f"color_{i}"
@@ -290,5 +485,6 @@ class ExtractKeyColors(DataNode):
                 settable=False,
                 )
             )      
+            self._live_color_params.append(param_name)
 
         return
\ No newline at end of file
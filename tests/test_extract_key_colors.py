@@ -0,0 +1,172 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+pytest.importorskip("griptape_nodes")
+
+from griptape.artifacts import ImageArtifact  # noqa: E402
+from griptape_nodes.exe_types.core_types import Parameter  # noqa: E402
+
+from keycolors import extract_key_colors  # noqa: E402
+from keycolors.extract_key_colors import ExtractKeyColors  # noqa: E402
+
+# Five well separated colors, used where a test needs more than a couple of distinct colors
+PALETTE = [(20, 40, 200), (230, 200, 20), (200, 30, 30), (30, 160, 60), (240, 240, 240)]
+
+
+def _png(pixels: np.ndarray) -> bytes:
+    """Encode an (H, W, 3) uint8 array as PNG bytes."""
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _stripes(*colors: tuple[int, int, int], width: int = 32, height: int = 32) -> np.ndarray:
+    """Build an (H, W, 3) uint8 image of vertical stripes, narrower for later colors."""
+    widths = [width - i for i in range(len(colors))]
+    return np.repeat(np.array(colors, dtype=np.uint8), widths, axis=0)[None].repeat(height, axis=0)
+
+
+def _image_artifact(pixels: np.ndarray) -> ImageArtifact:
+    return ImageArtifact(_png(pixels), format="png", width=pixels.shape[1], height=pixels.shape[0])
+
+
+def _color_param_names(node: ExtractKeyColors) -> list[str]:
+    return [param.name for param in node.parameters if param.name.startswith("color_")]
+
+
+def test_histogram_orders_two_color_image_by_area():
+    node = ExtractKeyColors(name="extract_key_colors")
+    pixels = np.zeros((10, 10, 3), dtype=np.uint8)
+    pixels[:, :3] = (20, 40, 200)
+    pixels[:, 3:] = (230, 200, 20)
+
+    colors = node._get_colors_by_prominence(pixels, 3)
+
+    assert colors.tolist() == [[230, 200, 20], [20, 40, 200]]
+
+
+@pytest.mark.parametrize("color", [(255, 255, 255), (0, 0, 0), (128, 128, 128)])
+def test_histogram_returns_solid_neutral_colors_exactly(color):
+    node = ExtractKeyColors(name="extract_key_colors")
+
+    colors = node._get_colors_by_algorithm(_png(np.full((48, 64, 3), color, dtype=np.uint8)), 3, "Histogram")
+
+    assert colors == [color]
+
+
+def test_histogram_finds_small_regions_next_to_a_noisy_dominant_color():
+    # 70% blue and three 10% stripes, all with Gaussian noise spreading them over many bins
+    stripes = [(200, 40, 40), (40, 160, 60), (230, 210, 60)]
+    pixels = np.empty((256, 256, 3))
+    pixels[:] = (70, 130, 200)
+    for i, color in enumerate(stripes):
+        pixels[:, 179 + i * 26 : 205 + i * 26] = color
+    pixels += np.random.default_rng(0).normal(0, 12, pixels.shape)
+    node = ExtractKeyColors(name="extract_key_colors")
+
+    colors = np.array(node._get_colors_by_algorithm(_png(np.clip(np.rint(pixels), 0, 255).astype(np.uint8)), 12, "Histogram"))
+
+    assert np.abs(colors[0] - (70, 130, 200)).max() <= 8
+    for color in stripes:
+        assert np.abs(colors - color).max(axis=1).min() <= 8
+
+
+@pytest.mark.parametrize("noise", [0, 6, 12])
+@pytest.mark.parametrize("num_colors", [6, 12])
+def test_histogram_recovers_noisy_palette_closely(noise, num_colors):
+    # Six regions of decreasing area; 6-bit bins keep every recovered color within a few levels
+    palette = [(70, 130, 200), (200, 40, 40), (40, 160, 60), (230, 210, 60), (240, 240, 240), (30, 30, 30)]
+    widths = [90, 51, 38, 31, 26, 20]
+    pixels = np.repeat(np.array(palette, dtype=float), widths, axis=0)[None, :, :].repeat(256, axis=0)
+    pixels += np.random.default_rng(0).normal(0, noise, pixels.shape)
+    node = ExtractKeyColors(name="extract_key_colors")
+
+    colors = np.array(node._get_colors_by_algorithm(_png(np.clip(np.rint(pixels), 0, 255).astype(np.uint8)), num_colors, "Histogram"))
+
+    for color in palette:
+        assert np.abs(colors - color).max(axis=1).min() <= 6
+
+
+def test_first_process_removes_color_parameters_restored_from_a_workflow():
+    node = ExtractKeyColors(name="extract_key_colors")
+    for i in range(1, 8):
+        node.add_parameter(Parameter(name=f"color_{i}", type="str", tooltip="Hex color", default_value="#123456"))
+        node.parameter_values[f"color_{i}"] = "#123456"
+    node.set_parameter_value("input_image", _image_artifact(_stripes(*PALETTE[:2])))
+    node.set_parameter_value("num_colors", 3)
+
+    node.process()
+
+    assert _color_param_names(node) == ["color_1", "color_2"]
+    assert [node.get_parameter_by_name(name).default_value for name in _color_param_names(node)] == ["#1428c8", "#e6c814"]
+    assert not any(name.startswith("color_") for name in node.parameter_values)
+
+
+def test_second_process_with_fewer_colors_leaves_only_the_new_parameters():
+    node = ExtractKeyColors(name="extract_key_colors")
+    node.set_parameter_value("input_image", _image_artifact(_stripes(*PALETTE)))
+    node.set_parameter_value("num_colors", 5)
+    node.process()
+    assert _color_param_names(node) == ["color_1", "color_2", "color_3", "color_4", "color_5"]
+
+    node.set_parameter_value("num_colors", 2)
+    node.process()
+
+    assert _color_param_names(node) == ["color_1", "color_2"]
+    assert node.number_of_color_params == 2
+
+
+def test_process_batch_matches_sequential_extraction_in_input_order():
+    images = [_stripes(*PALETTE[:2]), _stripes(*PALETTE[2:]), _stripes(*PALETTE[1:4])]
+    artifacts = [_image_artifact(pixels) for pixels in images]
+    artifacts.insert(2, artifacts[0])  # Same bytes again, served from the pixel cache
+    node = ExtractKeyColors(name="extract_key_colors")
+    node.set_parameter_value("num_colors", 4)
+
+    colors = node.process_batch(artifacts)
+
+    assert colors == [node._get_colors_by_algorithm(artifact.to_bytes(), 4, "Histogram") for artifact in artifacts]
+    assert colors[2] == colors[0]
+    assert len({tuple(result) for result in colors}) == 3
+
+
+@pytest.fixture
+def empty_pixel_cache():
+    extract_key_colors._pixel_cache.clear()
+    yield extract_key_colors._pixel_cache
+    extract_key_colors._pixel_cache.clear()
+
+
+def test_load_pixels_returns_cached_array_for_same_bytes(empty_pixel_cache):
+    image_bytes = _png(_stripes(*PALETTE[:2]))
+
+    first = extract_key_colors._load_pixels(image_bytes)
+    second = extract_key_colors._load_pixels(bytes(image_bytes))
+
+    assert second is first
+    assert len(empty_pixel_cache) == 1
+
+
+def test_load_pixels_evicts_least_recently_used_past_cache_size(empty_pixel_cache):
+    size = extract_key_colors.PIXEL_CACHE_SIZE
+    images = [_png(np.full((8, 8, 3), i, dtype=np.uint8)) for i in range(size + 1)]
+    loaded = [extract_key_colors._load_pixels(image_bytes) for image_bytes in images[:size]]
+    extract_key_colors._load_pixels(images[0])  # Now the most recently used
+
+    extract_key_colors._load_pixels(images[size])
+
+    assert len(empty_pixel_cache) == size
+    assert extract_key_colors._load_pixels(images[0]) is loaded[0]
+    assert extract_key_colors._load_pixels(images[1]) is not loaded[1]
+
+
+def test_load_pixels_returns_read_only_array(empty_pixel_cache):
+    pixels = extract_key_colors._load_pixels(_png(_stripes(*PALETTE[:2])))
+
+    assert pixels.shape == (32, 63, 3)
+    assert not pixels.flags.writeable
+    with pytest.raises(ValueError):
+        pixels[0, 0] = 0
@@ -0,0 +1,86 @@
+import numpy as np
+
+from keycolors._histogram import (
+    bin_mean_colors,
+    build_histogram,
+    histogram_prominence,
+    quantize6,
+    select_prominent_colors,
+)
+
+
+def _pixels(*regions: tuple[tuple[int, int, int], int]) -> np.ndarray:
+    """Build an (N, 3) uint8 pixel array from (color, count) pairs."""
+    return np.concatenate([np.tile(np.array(color, dtype=np.uint8), (count, 1)) for color, count in regions])
+
+
+def test_select_prominent_colors_orders_by_count():
+    colors = np.array([[0, 0, 0], [255, 0, 0], [0, 0, 255]])
+    counts = np.array([10, 30, 20])
+
+    selected = select_prominent_colors(colors, counts, 3)
+
+    assert selected.tolist() == [[255, 0, 0], [0, 0, 255], [0, 0, 0]]
+
+
+def test_select_prominent_colors_drops_near_duplicates():
+    colors = np.array([[200, 0, 0], [205, 5, 0], [0, 200, 0]])
+    counts = np.array([30, 20, 10])
+
+    selected = select_prominent_colors(colors, counts, 3)
+
+    assert selected.tolist() == [[200, 0, 0], [0, 200, 0]]
+
+
+def test_select_prominent_colors_caps_at_num_colors():
+    colors = np.array([[0, 0, 0], [255, 255, 255], [255, 0, 0]])
+    counts = np.array([3, 2, 1])
+
+    assert len(select_prominent_colors(colors, counts, 2)) == 2
+
+
+def test_select_prominent_colors_looks_past_many_near_duplicates():
+    # A noisy dominant color yields many near-identical candidates that all outscore the second color
+    blues = np.array([[0, 0, 200 + i % 10] for i in range(100)])
+    colors = np.concatenate([blues, [[200, 0, 0]]])
+    counts = np.concatenate([np.arange(200, 100, -1), [50]])
+
+    selected = select_prominent_colors(colors, counts, 2)
+
+    assert selected.tolist() == [[0, 0, 200], [200, 0, 0]]
+
+
+def test_quantize6_packs_top_six_bits_per_channel():
+    pixels = np.array([[0, 0, 0], [255, 255, 255], [4, 8, 12]], dtype=np.uint8)
+
+    assert quantize6(pixels).tolist() == [0, 262143, (1 << 12) | (2 << 6) | 3]
+
+
+def test_build_histogram_counts_every_pixel_in_its_bin():
+    pixels = _pixels(((255, 0, 0), 5), ((0, 0, 255), 3))
+
+    hist = build_histogram(quantize6(pixels))
+
+    assert hist.shape == (64, 64, 64)
+    assert hist.sum() == 8
+    assert hist[63, 0, 0] == 5
+    assert hist[0, 0, 63] == 3
+
+
+def test_histogram_prominence_sums_neighborhood_and_clips_at_edges():
+    hist = np.zeros((64, 64, 64), dtype=np.int64)
+    hist[0, 0, 0] = 4
+    hist[1, 1, 1] = 2
+    hist[3, 3, 3] = 7
+    colors = np.array([[0, 0, 0], [4, 4, 4], [12, 12, 12]])
+
+    assert histogram_prominence(hist, colors).tolist() == [6, 6, 7]
+
+
+def test_bin_mean_colors_averages_member_pixels():
+    pixels = _pixels(((8, 20, 28), 1), ((10, 22, 30), 1), ((200, 0, 0), 1))
+    idx = quantize6(pixels)
+
+    means = bin_mean_colors(idx, pixels, np.array([idx[0], idx[2]]))
+
+    assert means.tolist() == [[9, 21, 29], [200, 0, 0]]